@@ -0,0 +1,197 @@
+"""
+JIT-compiled numeric kernels for the anomaly detection hot path.
+
+ADWIN bucket maintenance and the rolling Z-score are tight scalar loops over
+small arrays -- exactly the compute-bound profile that Numba's @njit turns
+into native code. The kernels operate in place on preallocated NumPy arrays
+so no Python objects are allocated per sample, and nogil=True lets them run
+while the socket thread makes progress. Numba is an optional accelerator:
+when it is not installed the same functions run as plain Python, just slower.
+"""
+
+import math
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba missing: fall back to the interpreted functions
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        def decorate(func):
+            return func
+        return decorate
+
+# ADWIN keeps O(log W) buckets, so a small fixed capacity never overflows in
+# practice and lets the bucket arrays be allocated once up front.
+BUCKET_CAPACITY = 128
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _insert(row, sizes, n, value):
+    """Append a new size-1 bucket for ``value``; returns the new bucket count."""
+    row[n] = value
+    sizes[n] = 1
+    return n + 1
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _compress(row, sizes, n):
+    """
+    Merge equal-size buckets pairwise in a single left-to-right pass.
+
+    A read cursor walks the buckets while a write cursor compacts them in
+    place: when the incoming bucket matches the size of the last written
+    one, the two merge into a bucket of twice the size; otherwise the
+    bucket is copied forward. Merging in pairs keeps bucket sizes on the
+    exponential ladder ADWIN expects (a run of four size-1 buckets becomes
+    two size-2 buckets, not one size-4 bucket), so no single bucket can
+    swallow an arbitrarily long run and the window stays at O(log W)
+    buckets. Returns the new bucket count.
+    """
+    write = 0
+    for read in range(n):
+        if write > 0 and sizes[write - 1] == sizes[read]:
+            # Equal sizes, so the merged mean is the plain average
+            row[write - 1] = (row[write - 1] + row[read]) / 2.0
+            sizes[write - 1] *= 2
+        else:
+            row[write] = row[read]
+            sizes[write] = sizes[read]
+            write += 1
+    return write
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _detect(row, sizes, n, two_log, stats):
+    """
+    Test every window split for a significant difference in means.
+
+    ``two_log`` is the precomputed 2*log(4/delta); with the harmonic mean
+    m = n0*n1/(n0+n1), the cut threshold sqrt(2*m*log(4/delta)/(n0*n1))
+    reduces to sqrt(two_log/(n0+n1)) — one division and one sqrt per split.
+
+    Prefix sums of the bucket sizes and (weighted, squared) values are built
+    once so each split costs O(1). On drift the surviving tail buckets are
+    shifted to the front of the arrays and ``stats`` receives the tail's
+    (width, mean, M2) in Welford form, where M2 is the between-bucket sum of
+    squared deviations (buckets only retain their means, so within-bucket
+    spread is not recoverable). Returns ``(changed, new_n)``.
+    """
+    if n < 2:
+        return False, n
+    # cumsum runs as a C loop both under Numba and on the interpreted
+    # fallback path, unlike a hand-rolled accumulation
+    weighted = row[:n] * sizes[:n]
+    ps = np.cumsum(sizes[:n])
+    pw = np.cumsum(weighted)
+    pw2 = np.cumsum(row[:n] * weighted)
+
+    for i in range(1, n):
+        n0 = ps[i - 1]
+        n1 = ps[n - 1] - n0
+        if n0 == 0.0 or n1 == 0.0:
+            continue
+        u0 = pw[i - 1] / n0
+        u1 = (pw[n - 1] - pw[i - 1]) / n1
+        eps = math.sqrt(two_log / (n0 + n1))
+        if abs(u0 - u1) > eps:
+            # Concept drift detected: keep only the tail of the window
+            tail = n - i
+            for j in range(tail):
+                row[j] = row[i + j]
+                sizes[j] = sizes[i + j]
+            tail_sum = pw[n - 1] - pw[i - 1]
+            tail_sumsq = pw2[n - 1] - pw2[i - 1]
+            tail_mean = tail_sum / n1
+            tail_m2 = tail_sumsq - n1 * tail_mean * tail_mean
+            stats[0] = n1
+            stats[1] = tail_mean
+            stats[2] = tail_m2 if tail_m2 > 0.0 else 0.0
+            return True, tail
+    return False, n
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _zscore(window, head, count, total, sumsq, value, thr2):
+    """
+    Push ``value`` into the circular window and test its Z-score.
+
+    Maintains the running sum and sum of squares incrementally. ``thr2`` is
+    the squared Z threshold: testing ``diff**2 > thr2 * variance`` decides
+    ``|diff|/std > threshold`` without the sqrt, division, and abs. Returns
+    ``(is_anomaly, head, count, total, sumsq)`` so the caller can carry the
+    scalar state between calls.
+    """
+    size = window.shape[0]
+    if count == size:
+        evicted = window[head]
+        total += value - evicted
+        sumsq += value * value - evicted * evicted
+    else:
+        total += value
+        sumsq += value * value
+        count += 1
+    window[head] = value
+    head = (head + 1) % size
+
+    # Ensure the window is sufficiently filled before detecting anomalies
+    if count < size:
+        return False, head, count, total, sumsq
+
+    mean = total / size
+    variance = sumsq / size - mean * mean
+    if variance < 1e-12:
+        variance = 1e-12  # Same floor as the old std_dev = 1e-6 fallback
+    diff = value - mean
+    return diff * diff > thr2 * variance, head, count, total, sumsq
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def adwin_update(row, sizes, counts, stats, value, two_log):
+    """
+    Full ADWIN step for one sample: Welford stats, insert, compress, detect.
+
+    All mutable state lives in arrays so the function is self-contained and
+    AOT-exportable: ``counts`` is a one-element int64 array holding the
+    bucket count, ``stats`` holds (width, mean, M2) and is rewritten with
+    the surviving tail's statistics when drift resets the window. Returns
+    True when concept drift is detected.
+    """
+    stats[0] += 1.0
+    delta_v = value - stats[1]
+    stats[1] += delta_v / stats[0]
+    stats[2] += delta_v * (value - stats[1])
+    n = _insert(row, sizes, counts[0], value)
+    n = _compress(row, sizes, n)
+    changed, n = _detect(row, sizes, n, two_log, stats)
+    counts[0] = n
+    return changed
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def zscore_update(window, cursor, sums, value, thr2):
+    """
+    Full rolling Z-score step for one sample, with state held in arrays.
+
+    ``cursor`` is int64 (head, count) and ``sums`` is float64 (total,
+    sum of squares); both are updated in place. Returns True when the
+    sample's squared distance exceeds thr2 times the window variance.
+    """
+    is_anomaly, head, count, total, sumsq = _zscore(
+        window, cursor[0], cursor[1], sums[0], sums[1], value, thr2)
+    cursor[0] = head
+    cursor[1] = count
+    sums[0] = total
+    sums[1] = sumsq
+    return is_anomaly
+
+
+try:
+    # Prefer the AOT-compiled extension when it has been built (see
+    # build_ext.py): the same kernels, but native from the first call with
+    # no JIT warm-up and no Numba needed at runtime.
+    from anomaly_native import adwin_update, zscore_update  # noqa: F811
+except ImportError:
+    pass
@@ -0,0 +1,29 @@
+"""
+Ahead-of-time compilation of the anomaly detection kernels.
+
+Running this script produces an ``anomaly_native`` extension module exporting
+the same per-sample entry points as _adwin_core. When the extension is
+present, _adwin_core imports it in preference to the JIT path, so the server
+runs native code from the very first sample — no ~1 s first-call compile
+stall — and end users do not need Numba installed at runtime.
+
+Usage: python build_ext.py
+"""
+
+from numba.pycc import CC
+
+import _adwin_core
+
+cc = CC('anomaly_native')
+
+# pycc needs the undecorated Python functions; the @njit wrappers keep them
+# on .py_func (or are the plain functions when Numba is absent, but this
+# script requires Numba anyway). Calls into the other @njit kernels are
+# compiled along with them.
+cc.export('adwin_update', 'b1(f8[:], i8[:], i8[:], f8[:], f8, f8)')(
+    getattr(_adwin_core.adwin_update, 'py_func', _adwin_core.adwin_update))
+cc.export('zscore_update', 'b1(f8[:], i8[:], f8[:], f8, f8)')(
+    getattr(_adwin_core.zscore_update, 'py_func', _adwin_core.zscore_update))
+
+if __name__ == '__main__':
+    cc.compile()
@@ -1,6 +1,10 @@
-import socket
 import math
-from collections import deque
+import socket
+import struct
+
+import numpy as np
+
+from _adwin_core import BUCKET_CAPACITY, adwin_update, zscore_update
 
 class ADWIN:
     """
@@ -14,80 +18,46 @@ class ADWIN:
     """
     def __init__(self, delta=0.002):
         self.delta = delta  # Confidence parameter for detecting changes
-        self.bucket_row = []  # Buckets containing recent data
-        self.bucket_sizes = []  # Size of each bucket
-        self.total = 0  # Running total of values in the window
-        self.variance = 0  # Running variance of values in the window
-        self.width = 0  # Window width (number of elements)
+        self._two_log = 2 * math.log(4 / delta)  # Hoisted out of the split loop
+        # Buckets live in preallocated arrays so the JIT kernels mutate them
+        # in place; ADWIN needs at most O(log W) buckets, well under capacity.
+        self.bucket_row = np.zeros(BUCKET_CAPACITY, np.float64)  # Bucket means
+        self.bucket_sizes = np.zeros(BUCKET_CAPACITY, np.int64)  # Size of each bucket
+        self._counts = np.zeros(1, np.int64)  # Number of buckets currently in use
+        self._stats = np.zeros(3, np.float64)  # Welford (width, mean, M2) of the window
 
     def update(self, value):
         """
         Update the ADWIN model with a new value and detect changes.
-        
+
         Parameters:
         - value (float): New data point to process.
-        
+
         Returns:
         - (bool): Whether a change (concept drift) is detected.
         """
-        self.insert_element(value)  # Insert new data point into the window
-        self.compress_buckets()  # Compress adjacent buckets with the same size
-        return self.detect_change()  # Check if concept drift is detected
+        return adwin_update(self.bucket_row, self.bucket_sizes, self._counts,
+                            self._stats, value, self._two_log)
 
-    def insert_element(self, value):
-        """
-        Insert a new data element into the bucket row and update total and variance.
-        """
-        self.width += 1
-        self.total += value
-        self.variance += value * value
-        self.bucket_row.append(value)
-        self.bucket_sizes.append(1)  # Each new bucket starts with size 1
+    @property
+    def n(self):
+        """Number of buckets currently in use."""
+        return int(self._counts[0])
 
-    def compress_buckets(self):
-        """
-        Compress adjacent buckets of the same size by merging them into a single bucket.
-        This reduces the window size while maintaining data accuracy.
-        """
-        i = 0
-        while i < len(self.bucket_sizes):
-            k = i
-            while k < len(self.bucket_sizes) and self.bucket_sizes[i] == self.bucket_sizes[k]:
-                k += 1
-            if k == i + 1:
-                i = k  # Move to the next group of buckets
-            else:
-                new_bucket = sum(self.bucket_row[i:k]) / (k - i)  # Average of merged buckets
-                self.bucket_row[i] = new_bucket  # Update the bucket
-                self.bucket_sizes[i] *= (k - i)  # Increase bucket size
-                del self.bucket_row[i+1:k]
-                del self.bucket_sizes[i+1:k]  # Remove merged buckets
-            i += 1
-
-    def detect_change(self):
-        """
-        Detect if a change (concept drift) has occurred using the ADWIN algorithm.
-        
-        Returns:
-        - (bool): True if a change is detected, otherwise False.
-        """
-        for i in range(1, len(self.bucket_sizes)):
-            n0, n1 = sum(self.bucket_sizes[:i]), sum(self.bucket_sizes[i:])
-            if n0 == 0 or n1 == 0:
-                continue
-            u0 = sum(x * y for x, y in zip(self.bucket_row[:i], self.bucket_sizes[:i])) / n0
-            u1 = sum(x * y for x, y in zip(self.bucket_row[i:], self.bucket_sizes[i:])) / n1
-            m = 1 / (1 / n0 + 1 / n1)
-            eps = math.sqrt(2 * m * math.log(4 / self.delta) / n0 / n1)
-            if abs(u0 - u1) > eps:
-                # Concept drift detected, reset window
-                self.width = n1
-                self.total = sum(x * y for x, y in zip(self.bucket_row[i:], self.bucket_sizes[i:]))
-                self.variance = sum(x * x * y for x, y in zip(self.bucket_row[i:], self.bucket_sizes[i:]))
-                self.bucket_row = self.bucket_row[i:]
-                self.bucket_sizes = self.bucket_sizes[i:]
-                return True
-        return False
+    @property
+    def width(self):
+        """Window width (number of elements)."""
+        return int(self._stats[0])
+
+    @property
+    def mean(self):
+        """Running mean of values in the window (Welford)."""
+        return self._stats[1]
+
+    @property
+    def M2(self):
+        """Running sum of squared deviations from the mean (Welford)."""
+        return self._stats[2]
 
 class AnomalyDetector:
     """
@@ -100,8 +70,11 @@ class AnomalyDetector:
     """
     def __init__(self, window_size=50, z_threshold=3):
         self.adwin = ADWIN()  # Initialize ADWIN for concept drift detection
-        self.window = deque(maxlen=window_size)  # Fixed-size window for anomaly detection
+        self.window = np.zeros(window_size, np.float64)  # Circular window buffer
+        self._cursor = np.zeros(2, np.int64)  # Kernel state: (head, count)
+        self._sums = np.zeros(2, np.float64)  # Kernel state: (total, sum of squares)
         self.z_threshold = z_threshold  # Threshold for Z-score to detect anomalies
+        self._thr2 = z_threshold * z_threshold  # Squared threshold for the kernel
 
     def detect_anomaly(self, value):
         """
@@ -114,19 +87,116 @@ class AnomalyDetector:
         - is_anomaly (bool): True if an anomaly is detected.
         - concept_drift (bool): True if a concept drift is detected.
         """
-        self.window.append(value)  # Add the new value to the sliding window
         change_detected = self.adwin.update(value)  # Check for concept drift
+        is_anomaly = zscore_update(self.window, self._cursor, self._sums,
+                                   value, self._thr2)
+        return is_anomaly, change_detected  # Return anomaly and concept drift status
+
+class FadingAnomalyDetector:
+    """
+    Windowless variant of the Z-score detector using exponentially faded
+    statistics. Instead of keeping the last window_size values, every
+    statistic decays by a constant factor per sample, which weights recent
+    data the most while needing O(1) memory and no eviction bookkeeping.
+    A fade of f behaves like a sliding window of roughly 1/(1-f) samples.
+
+    Parameters:
+    - z_threshold: Z-score threshold for flagging anomalies.
+    - fade: Per-sample decay factor in (0, 1); closer to 1 fades slower.
+    """
+    def __init__(self, z_threshold=3, fade=0.995):
+        self.fade = fade  # Decay applied to all statistics each sample
+        self._thr2 = z_threshold * z_threshold  # Squared threshold
+        self.N = 0.0  # Faded sample count
+        self.S = 0.0  # Faded sum of values
+        self.S2 = 0.0  # Faded sum of squared values
+        self.count = 0  # Raw number of samples seen, for the warm-up guard
+        self._warmup = 1.0 / (1.0 - fade)  # Effective window length
+
+    def detect_anomaly(self, value):
+        """
+        Update the faded statistics with a new value and test its Z-score.
+
+        Parameters:
+        - value (float): The incoming data point.
+
+        Returns:
+        - is_anomaly (bool): True if an anomaly is detected.
+        """
+        fade = self.fade
+        self.N = fade * self.N + 1.0
+        self.S = fade * self.S + value
+        self.S2 = fade * self.S2 + value * value
+        self.count += 1
+
+        # Ensure enough history has accumulated before detecting anomalies
+        if self.count < self._warmup:
+            return False
+
+        mean = self.S / self.N
+        variance = self.S2 / self.N - mean * mean
+        if variance < 1e-12:
+            variance = 1e-12  # Same floor as the windowed detector
+        diff = value - mean
+        return diff * diff > self._thr2 * variance
+
+
+def make_detector(delta=0.002, z_threshold=3, window_size=50):
+    """
+    Build a per-sample detection closure specialized for fixed parameters.
+
+    The server's delta, z_threshold, and window_size never change per call,
+    so the returned function captures the state arrays and the derived
+    constants (2*log(4/delta), z_threshold squared) as closure locals:
+    the hot path does only free-variable loads, which CPython resolves
+    faster than attribute lookups, and the constants are folded once here.
+
+    Parameters:
+    - delta: Confidence parameter for ADWIN drift detection.
+    - z_threshold: Z-score threshold for flagging anomalies.
+    - window_size: The size of the window used for Z-score anomaly detection.
+
+    Returns:
+    - detect (callable): detect(value) -> (is_anomaly, concept_drift).
+    """
+    two_log = 2 * math.log(4 / delta)
+    thr2 = z_threshold * z_threshold
+    bucket_row = np.zeros(BUCKET_CAPACITY, np.float64)
+    bucket_sizes = np.zeros(BUCKET_CAPACITY, np.int64)
+    counts = np.zeros(1, np.int64)
+    stats = np.zeros(3, np.float64)
+    window = np.zeros(window_size, np.float64)
+    cursor = np.zeros(2, np.int64)
+    sums = np.zeros(2, np.float64)
+    adwin_step = adwin_update  # Bind the kernels once, skipping global lookups
+    zscore_step = zscore_update
+
+    def detect(value):
+        concept_drift = adwin_step(bucket_row, bucket_sizes, counts, stats,
+                                   value, two_log)
+        is_anomaly = zscore_step(window, cursor, sums, value, thr2)
+        return is_anomaly, concept_drift
+
+    return detect
+
 
-        # Ensure the window is sufficiently filled before detecting anomalies
-        if len(self.window) < self.window.maxlen:
-            return False, change_detected
+BATCH_SIZE = 64  # Samples per network batch; must match simulate_data.py
 
-        mean = sum(self.window) / len(self.window)  # Compute the mean of the window
-        variance = sum((x - mean) ** 2 for x in self.window) / len(self.window)  # Compute variance
-        std_dev = math.sqrt(variance) if variance > 1e-6 else 1e-6  # Avoid division by zero
 
-        z_score = abs((value - mean) / std_dev)  # Compute Z-score for the value
-        return z_score > self.z_threshold, change_detected  # Return anomaly and concept drift status
+def recv_exact(sock, n):
+    """
+    Receive exactly n bytes from the socket, looping over partial reads.
+
+    Returns the bytes, or None if the peer closed the connection.
+    """
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            return None
+        buf.extend(chunk)
+    return bytes(buf)
+
 
 def start_server():
     """
@@ -141,34 +211,26 @@ def start_server():
     client_socket, addr = server_socket.accept()  # Accept a connection from a client
     print(f"Connected to {addr}")
 
-    anomaly_detector = AnomalyDetector()  # Initialize anomaly detector
+    detect_anomaly = make_detector()  # Specialized detection closure
+    unpack_batch = struct.Struct(f'<{BATCH_SIZE}d').unpack  # Precompiled batch format
 
     while True:
-        # Receive data from the client
-        data = client_socket.recv(1024).decode('utf-8')
-        if not data or data == 'exit':
+        # Receive one batch of little-endian doubles from the client
+        payload = recv_exact(client_socket, BATCH_SIZE * 8)
+        if payload is None:
             print("Client has disconnected.")
             break
 
-        try:
-            data_point = float(data)  # Convert received data to a float
-            print(f"Received data: {data_point}")
-
-            # Detect anomalies and concept drift
-            is_anomaly, concept_drift = anomaly_detector.detect_anomaly(data_point)
-
-            # Send response to the client based on detection results
+        # Detect anomalies and concept drift for each sample in the batch,
+        # answering with one flag byte per sample: bit 1 = anomaly, bit 0 = drift
+        flags = bytearray(BATCH_SIZE)
+        for i, data_point in enumerate(unpack_batch(payload)):
+            is_anomaly, concept_drift = detect_anomaly(data_point)
+            flags[i] = (is_anomaly << 1) | concept_drift
             if is_anomaly:
-                response = f"Anomaly detected: {data_point}"
-            elif concept_drift:
-                response = f"Concept drift detected: {data_point}"
-            else:
-                response = f"Data received: {data_point}"
-
-            client_socket.send(response.encode('utf-8'))  # Send response to client
-        except ValueError:
-            print(f"Invalid data received: {data}")
-            client_socket.send("Invalid data".encode('utf-8'))  # Inform client of invalid data
+                print(f"Anomaly detected: {data_point}")
+
+        client_socket.sendall(bytes(flags))  # Send per-sample flags to client
 
     client_socket.close()  # Close the connection with the client
     server_socket.close()  # Close the server socket
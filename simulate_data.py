@@ -1,75 +1,106 @@
 # simulate_data.py
 
 import socket
-import random
 import time
 import threading
-import queue
-import math
 
-data_queue = queue.Queue()
+import numpy as np
 
-def simulate_data(t):
+# Single-producer/single-consumer ring buffer shared with the visualizer.
+# The client thread is the only writer: it fills the slots first and only then
+# publishes them by advancing write_idx, a plain int whose rebind is atomic
+# under the GIL, so no lock is needed. The visualizer keeps its own read
+# cursor and never blocks the producer.
+RING_SIZE = 65536  # Far more samples than one redraw interval can produce
+ring_values = np.empty(RING_SIZE, np.float64)  # Sample values
+ring_flags = np.empty(RING_SIZE, np.uint8)  # 1 where the server flagged an anomaly
+write_idx = 0  # Monotonic count of samples published so far
+
+BATCH_SIZE = 64  # Samples per network batch; must match server.py
+
+
+def recv_exact(sock, n):
+    """
+    Receive exactly n bytes from the socket, looping over partial reads.
+
+    Returns the bytes, or None if the peer closed the connection.
     """
-    Simulates sensor data with regular patterns, seasonal elements, random noise,
-    and occasional anomalies.
-    
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            return None
+        buf.extend(chunk)
+    return bytes(buf)
+
+def simulate_batch(t0, batch_size, rng):
+    """
+    Simulates a batch of sensor data with regular patterns, seasonal elements,
+    random noise, and occasional anomalies, vectorized over the time steps.
+
     Parameters:
-    - t: time step (int)
-    
+    - t0: first time step of the batch (int)
+    - batch_size: number of consecutive time steps to generate (int)
+    - rng: numpy random Generator supplying the noise and anomalies
+
     Returns:
-    - value (float): The simulated sensor data.
-    - is_anomaly (bool): Whether the data is an anomaly.
+    - values (np.ndarray): The simulated sensor data, shape (batch_size,).
+    - is_anomaly (np.ndarray): Boolean mask marking the injected anomalies.
     """
+    ts = np.arange(t0, t0 + batch_size)
+
     # Regular pattern: simulate daily cycles (e.g., temperature)
-    regular_pattern = 50 + 10 * math.sin(2 * math.pi * t / 24)
-    
+    regular_pattern = 50 + 10 * np.sin(2 * np.pi * ts / 24)
+
     # Seasonal pattern: simulate yearly cycles (e.g., energy consumption)
-    seasonal_pattern = 10 * math.sin(2 * math.pi * t / 365)
-    
+    seasonal_pattern = 10 * np.sin(2 * np.pi * ts / 365)
+
     # Random noise
-    noise = random.uniform(-2, 2)
-    
-    # Occasionally introduce anomalies
-    if random.random() < 0.05:  # 5% chance of anomaly
-        anomaly_value = regular_pattern + seasonal_pattern + noise + random.uniform(30, 40)
-        return anomaly_value, True
-    
-    return regular_pattern + seasonal_pattern + noise, False
+    noise = rng.uniform(-2, 2, batch_size)
+
+    # Occasionally introduce anomalies (5% chance per sample)
+    is_anomaly = rng.random(batch_size) < 0.05
+    spikes = np.where(is_anomaly, rng.uniform(30, 40, batch_size), 0.0)
+
+    return regular_pattern + seasonal_pattern + noise + spikes, is_anomaly
 
 def start_client():
     """
     Function to start the client that sends simulated data to the server.
     It continuously sends the simulated data to the server and receives responses.
     """
+    global write_idx
+
     client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     client_socket.connect(('localhost', 12345))  # Connect to the server
 
     try:
         t = 0  # Initialize time step
+        rng = np.random.default_rng()
         while True:
-            # Simulate data and send to server
-            floating_data, is_anomaly = simulate_data(t)
-            print(f"Sending: {floating_data}")
-            client_socket.send(str(floating_data).encode('utf-8'))
-
-            # Receive server response
-            response = client_socket.recv(1024).decode('utf-8')
-            print(f"Received from server: {response}")
-
-            # Add data to queue for visualization
-            if "Anomaly detected" in response:
-                anomaly_value = float(response.split(": ")[1])
-                data_queue.put((anomaly_value, True))
-            else:
-                normal_value = float(response.split(": ")[1])
-                data_queue.put((normal_value, False))
-
-            t += 1
-            time.sleep(0.3)  # Reduced sleep time for faster data generation
+            # Simulate one batch of data and send it as packed doubles
+            values, _ = simulate_batch(t, BATCH_SIZE, rng)
+            t += BATCH_SIZE
+            client_socket.sendall(values.astype('<f8', copy=False).tobytes())
+
+            # Receive one flag byte per sample: bit 1 = anomaly, bit 0 = drift
+            flags = recv_exact(client_socket, BATCH_SIZE)
+            if flags is None:
+                print("Server closed the connection.")
+                break
+            print(f"Sent batch of {BATCH_SIZE}, anomalies flagged: "
+                  f"{sum(1 for f in flags if f & 0b10)}")
+
+            # Publish the batch to the visualizer: write the ring slots first,
+            # then advance write_idx so the reader never sees unfilled slots
+            slots = (write_idx + np.arange(BATCH_SIZE)) % RING_SIZE
+            ring_values[slots] = values
+            ring_flags[slots] = (np.frombuffer(flags, np.uint8) >> 1) & 1
+            write_idx += BATCH_SIZE
+
+            time.sleep(0.3)  # Pace the stream one batch per interval
     except KeyboardInterrupt:
         print("Disconnecting from server...")
-        client_socket.send('exit'.encode('utf-8'))
 
     client_socket.close()
 
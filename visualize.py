@@ -1,50 +1,91 @@
-import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation
-import simulate_data  # Import the client module to access the data queue
-
-# Data structure to store the data stream and anomaly points
-data_stream = []  # Stores the data stream values
-anomalies = []  # Stores positions of anomalies (None if no anomaly)
-
-# Explanation of the chosen algorithm:
-# This algorithm fetches real-time data points from a simulated data queue and appends them to the data stream.
-# It checks if the current data point is an anomaly. If it is, the anomaly is marked and plotted on the graph.
-# Anomalies are highlighted using red scatter points to clearly identify them in the data stream plot.
-# This real-time visualization is useful in identifying patterns or unusual behaviors in the data as they occur.
-
-# Function to update the plot with real-time data
-def update(frame):
-    # Retrieve data points from the data queue (simulated real-time stream)
-    while not simulate_data.data_queue.empty():
-        data_point, is_anomaly = simulate_data.data_queue.get()  # Get the latest data point and anomaly flag
-        data_stream.append(data_point)  # Append new data to the stream
-        anomalies.append(data_point if is_anomaly else None)  # Mark anomaly position if detected
-
-    # Clear the current plot before redrawing
-    ax.clear()
-    
-    # Plot the real-time data stream
-    ax.plot(data_stream, label='Data Stream', color='blue')
-    
-    # Highlight anomalies with red scatter points
-    if anomalies:
-        anomaly_indices = [i for i, val in enumerate(anomalies) if val is not None]  # Indices of anomalies
-        anomaly_values = [val for val in anomalies if val is not None]  # Values of anomalies
-        ax.scatter(anomaly_indices, anomaly_values, color='red', label='Anomalies')  # Plot anomalies
-
-    # Set plot labels and legend
-    ax.legend(loc='upper left')
-    ax.set_title('Real-time Data Stream with Anomaly Detection')
-    ax.set_xlabel('Time')
-    ax.set_ylabel('Value')
-
-# Function to visualize the data in real-time
-def visualize_data():
-    global fig, ax
-    fig, ax = plt.subplots()  # Create a figure and axis for plotting
-    ani = FuncAnimation(fig, update, interval=1000)  # Update the plot every second
-    plt.show()  # Display the plot window
-
-# Main execution starts here
-if __name__ == "__main__":
-    visualize_data()  # Call the function to start visualizing real-time data
\ No newline at end of file
+import numpy as np
+import pyqtgraph as pg
+from pyqtgraph.Qt import QtCore
+import simulate_data  # Import the client module to access the shared ring buffer
+
+# Explanation of the chosen algorithm:
+# This algorithm fetches real-time data points from the shared ring buffer and
+# keeps only the most recent DISPLAY_WINDOW of them in a fixed-size circular
+# buffer behind persistent pyqtgraph items. Unlike matplotlib, which
+# re-rasterizes the whole canvas on every frame, pyqtgraph repaints just the
+# curve and scatter through Qt's scene graph (on the GPU when the OpenGL
+# backend is active), so the display comfortably refreshes at 60 Hz while the
+# CPU stays free for the detection loop.
+
+pg.setConfigOption('useOpenGL', True)  # Render through Qt's OpenGL backend
+
+DISPLAY_WINDOW = 5000  # Most recent samples kept on screen
+
+# Circular display buffers: values plus a parallel anomaly flag per slot
+buf = np.empty(DISPLAY_WINDOW, np.float64)
+anom = np.zeros(DISPLAY_WINDOW, bool)
+head = 0  # Next write position in the circular buffers
+count = 0  # Number of slots filled, capped at DISPLAY_WINDOW
+
+read_idx = 0  # This side's cursor into the shared ring buffer
+
+
+# Timer callback that refreshes the plot with real-time data
+def update():
+    global read_idx, head, count
+
+    # Drain new samples from the shared ring buffer. Snapshot the producer's
+    # published cursor once; everything below it is safe to read lock-free.
+    write_idx = simulate_data.write_idx
+    if write_idx - read_idx > simulate_data.RING_SIZE:
+        read_idx = write_idx - simulate_data.RING_SIZE  # Producer lapped us
+    if write_idx > read_idx:
+        slots = np.arange(read_idx, write_idx) % simulate_data.RING_SIZE
+        values = simulate_data.ring_values[slots]
+        flags = simulate_data.ring_flags[slots] != 0
+        read_idx = write_idx
+
+        if len(values) >= DISPLAY_WINDOW:
+            # More new data than the window holds: keep only the tail
+            buf[:] = values[-DISPLAY_WINDOW:]
+            anom[:] = flags[-DISPLAY_WINDOW:]
+            head = 0
+            count = DISPLAY_WINDOW
+        else:
+            dest = (head + np.arange(len(values))) % DISPLAY_WINDOW
+            buf[dest] = values
+            anom[dest] = flags
+            head = (head + len(values)) % DISPLAY_WINDOW
+            count = min(count + len(values), DISPLAY_WINDOW)
+
+    # Materialize the window in arrival order for drawing
+    if count == DISPLAY_WINDOW:
+        view = np.concatenate([buf[head:], buf[:head]])
+        aview = np.concatenate([anom[head:], anom[:head]])
+    else:
+        view = buf[:count]
+        aview = anom[:count]
+    xs = np.arange(read_idx - count, read_idx)  # Absolute sample indices
+
+    curve.setData(xs, view)
+    hit = np.flatnonzero(aview)
+    scat.setData(x=xs[hit], y=view[hit])
+
+
+# Function to visualize the data in real-time
+def visualize_data():
+    global plot, curve, scat
+    plot = pg.plot(title='Real-time Data Stream with Anomaly Detection')
+    plot.setLabel('bottom', 'Time')
+    plot.setLabel('left', 'Value')
+    plot.addLegend()
+
+    # Persistent plot items: created once, refreshed from the ring buffers
+    curve = plot.plot(pen='b', name='Data Stream')
+    scat = pg.ScatterPlotItem(pen=None, brush='r', size=7, name='Anomalies')
+    plot.addItem(scat)
+
+    timer = QtCore.QTimer()
+    timer.timeout.connect(update)
+    timer.start(16)  # Refresh at ~60 Hz
+
+    pg.exec()  # Run the Qt event loop until the window closes
+
+# Main execution starts here
+if __name__ == "__main__":
+    visualize_data()  # Call the function to start visualizing real-time data